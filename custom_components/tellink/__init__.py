@@ -3,53 +3,20 @@
 from __future__ import annotations
 
 import logging
-from datetime import timedelta
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import ConfigEntryNotReady
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-from homeassistant.helpers import issue_registry as ir
+from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
 
-from .const import DOMAIN
+from .const import DEFAULT_PIPELINED_LOGIN, DOMAIN
 from .api import TellinkAPI
+from .coordinator import TellinkCoordinator
 from .credentials import get_credential_store
+from .history import get_history_store
+from .repairs import create_reauth_issue, delete_reauth_issue
 
 _LOGGER = logging.getLogger(__name__)
 
-ISSUE_ID_REAUTH = "reauth_required"
-
-
-# ----------------------------------------------------------------------
-# Helpers: Repairs (issue registry)
-# ----------------------------------------------------------------------
-
-
-def _create_reauth_issue(
-    hass: HomeAssistant, entry: ConfigEntry, username: str | None
-) -> None:
-    """Create a Repairs issue to guide the user to reauthenticate (with Fix button)."""
-    ir.async_create_issue(
-        hass,
-        DOMAIN,
-        ISSUE_ID_REAUTH,
-        is_fixable=True,
-        severity=ir.IssueSeverity.ERROR,
-        translation_key="reauth_required",
-        translation_placeholders={
-            "entry_title": entry.title or "Tellink",
-            "username": username or "unknown",
-        },
-        # This 'data' block is passed to our repairs fix flow so we know which entry to fix
-        data={"entry_id": entry.entry_id, "username": username or "unknown"},
-        learn_more_url="https://my.home-assistant.io/redirect/config_flow_start?domain=tellink",
-    )
-
-
-def _delete_reauth_issue(hass: HomeAssistant) -> None:
-    """Delete the reauth issue if it exists."""
-    ir.async_delete_issue(hass, DOMAIN, ISSUE_ID_REAUTH)
-
 
 # ----------------------------------------------------------------------
 # Setup / Teardown
@@ -76,7 +43,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # If creds are missing or corrupt, open a Repairs issue and trigger reauth
     if not username or not password:
         _LOGGER.error("[%s] Missing/corrupt Tellink credentials", username or "unknown")
-        _create_reauth_issue(hass, entry, username)
+        create_reauth_issue(hass, entry, username)
         try:
             await hass.config_entries.async_start_reauth(entry)
         except Exception:  # noqa: BLE001
@@ -86,51 +53,27 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         raise ConfigEntryNotReady("Missing credentials")
 
     # Credentials are present; ensure any old issue is cleared
-    _delete_reauth_issue(hass)
-
-    api = TellinkAPI(username, password)
+    delete_reauth_issue(hass, entry.entry_id)
 
-    scan_interval = timedelta(seconds=entry.options.get("scan_interval", 3600))
-    retry_interval = timedelta(seconds=entry.options.get("retry_interval", 3600))
-
-    async def async_update_data():
-        """Fetch data from Tellink with retry/backoff logic."""
-        try:
-            _LOGGER.debug("[%s] Fetching Tellink data", username)
-            data = await api.get_data()
-        except Exception as err:  # noqa: BLE001
-            _LOGGER.warning(
-                "[%s] Update failed: %s; retrying in %s s",
-                username,
-                err,
-                retry_interval.total_seconds(),
-            )
-            coordinator.update_interval = retry_interval
-            raise UpdateFailed(err) from err
-
-        if not data:
-            coordinator.update_interval = retry_interval
-            raise UpdateFailed("Empty or invalid data returned from Tellink API")
-
-        coordinator.update_interval = scan_interval
-        return data
-
-    coordinator = DataUpdateCoordinator(
-        hass,
-        _LOGGER,
-        name=f"tellink_{username}",
-        update_method=async_update_data,
-        update_interval=scan_interval,
+    api = TellinkAPI(
+        username,
+        password,
+        pipelined=entry.options.get("pipelined_login", DEFAULT_PIPELINED_LOGIN),
     )
+    coordinator = TellinkCoordinator(hass, entry, api)
 
     try:
         await coordinator.async_config_entry_first_refresh()
+    except ConfigEntryAuthFailed:
+        # The coordinator already opened the Repairs issue; HA starts reauth
+        raise
     except Exception as err:  # noqa: BLE001
         _LOGGER.error("[%s] Failed initial Tellink data refresh: %s", username, err)
         raise ConfigEntryNotReady from err
 
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
     await hass.config_entries.async_forward_entry_setups(entry, ["sensor"])
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
 
     _LOGGER.info("[%s] Tellink integration successfully initialized", username)
     return True
@@ -141,7 +84,10 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     username = entry.data.get("username")
     unload_ok = await hass.config_entries.async_unload_platforms(entry, ["sensor"])
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id, None)
+        entries = hass.data[DOMAIN]
+        entries.pop(entry.entry_id, None)
+        if not entries:
+            hass.data.pop(DOMAIN)
         _LOGGER.debug("[%s] Unloaded Tellink integration", username)
     return unload_ok
 
@@ -150,15 +96,25 @@ async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Clean up credentials when an entry is removed."""
     cred_store = get_credential_store(hass)
     await cred_store.async_delete(entry.entry_id)
-    _LOGGER.debug("[%s] Removed stored credentials", entry.data.get("username"))
+    await get_history_store(hass).async_delete(entry.entry_id)
+    delete_reauth_issue(hass, entry.entry_id)
+    _LOGGER.debug(
+        "[%s] Removed stored credentials and history", entry.data.get("username")
+    )
 
 
-async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
-    """Reload Tellink config entry when options are updated."""
+async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply updated options live, reloading only when the change requires it."""
     username = entry.data.get("username")
-    _LOGGER.debug("Reloading Tellink config entry for %s", username)
-    await async_unload_entry(hass, entry)
-    await async_setup_entry(hass, entry)
+    coordinator: TellinkCoordinator | None = hass.data.get(DOMAIN, {}).get(
+        entry.entry_id
+    )
+    if coordinator is None or coordinator.requires_reload(entry):
+        _LOGGER.debug("Reloading Tellink config entry for %s", username)
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+
+    coordinator.async_apply_options(entry.options)
 
 
 # ----------------------------------------------------------------------
@@ -201,7 +157,7 @@ async def async_migrate_entry(hass: HomeAssistant, config_entry: ConfigEntry) ->
             _LOGGER.debug("[%s] Password moved to private storage", username)
         else:
             # No password found to migrate; create a Repair issue so user can reauth
-            _create_reauth_issue(hass, config_entry, data.get("username"))
+            create_reauth_issue(hass, config_entry, data.get("username"))
         new_version = 4
 
     if new_version != current_version:
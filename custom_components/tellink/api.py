@@ -5,31 +5,128 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
+import time
+from collections import deque
 from datetime import datetime
 
 import ssl
 
 import websockets
-from websockets.exceptions import ConnectionClosedError, WebSocketException
+from websockets.exceptions import ConnectionClosed, WebSocketException
 
 
 SSL_CONTEXT = ssl.create_default_context()
 
+LOGIN_SAMPLES = 20
+# Seconds to wait for all history answers after SessionCli
+HISTORY_TIMEOUT = 3
+
 _LOGGER = logging.getLogger(__name__)
 
+# Frame tags the portal uses to refuse a login (exact match)
+AUTH_REJECT_TAGS = frozenset({"LoginFailed", "InvalidCredentials", "BadCredentials"})
+
+# Close codes meaning the credentials were refused: policy violation and the
+# application-range equivalents of HTTP 401/403
+AUTH_CLOSE_CODES = frozenset({1008, 4401, 4403})
+
+# History kind -> (request tag, response tag) on the authenticated socket
+HISTORY_FRAMES = {
+    "usage": ("UsageHistory", "UsageHistoryCli"),
+    "topup": ("TopupHistory", "TopupHistoryCli"),
+}
+
+# Candidate record keys, first match wins
+_HISTORY_DATE_KEYS = ("date", "timestamp", "time")
+_HISTORY_CATEGORY_KEYS = ("category", "type", "service")
+_HISTORY_AMOUNT_KEYS = ("amount", "cost", "price")
+
+
+class TellinkError(Exception):
+    """Base class for Tellink API errors."""
+
+
+class TellinkAuthError(TellinkError):
+    """The portal rejected the credentials."""
+
+
+class TellinkTimeoutError(TellinkError):
+    """The portal did not answer in time."""
+
+
+class TellinkConnectionError(TellinkError):
+    """The WebSocket could not be opened or was dropped."""
+
+
+class TellinkProtocolError(TellinkError):
+    """The portal answered with frames we do not understand."""
+
+
+class _EarlyCredentialsRefused(TellinkError):
+    """The portal did not accept credentials sent before its challenge."""
+
+
+def _closed_error(err: ConnectionClosed, context: str) -> TellinkError:
+    """Classify a closed socket: auth only for a close code that means it."""
+    code = err.rcvd.code if err.rcvd is not None else None
+    if code in AUTH_CLOSE_CODES:
+        return TellinkAuthError(f"Login refused {context} (close code {code})")
+    # Normal closure, going away (portal restart) and the rest are transient
+    return TellinkConnectionError(f"Connection closed {context}: {err}")
+
 
 class TellinkAPI:
     """Handle communication with the Tellink prepaid portal via WebSocket."""
 
     URL = "wss://www.mytellink.com/prepaid/"
 
-    def __init__(self, username: str, password: str):
+    def __init__(self, username: str, password: str, pipelined: bool = False):
         self.username = username
         self.password = password
+        # Send Credentials without waiting for the challenge; cleared on fallback
+        self.pipelined = pipelined
+        # Recent login durations per mode, for comparing pipelined vs strict
+        self.login_seconds: dict[str, deque[float]] = {
+            "pipelined": deque(maxlen=LOGIN_SAMPLES),
+            "strict": deque(maxlen=LOGIN_SAMPLES),
+        }
+
+    async def get_data(
+        self, history_since: dict[str, str | None] | None = None
+    ) -> dict:
+        """Login through WebSocket and parse the SessionCli JSON.
+
+        When history_since maps history kinds to cursors, records newer than
+        each cursor are also requested and returned under "history".
+        Raises a TellinkError subclass describing why no data could be fetched.
+        """
+        if not self.pipelined:
+            return await self._fetch(False, history_since)
+
+        try:
+            return await self._fetch(True, history_since)
+        except (_EarlyCredentialsRefused, TellinkAuthError, TellinkTimeoutError) as err:
+            # A rejection or silence may just mean the portal refuses early
+            # credentials; only the strict retry decides what really failed
+            _LOGGER.info(
+                "[%s] Pipelined login failed (%s); retrying with strict login",
+                self.username,
+                err,
+            )
+
+        data = await self._fetch(False, history_since)
+        # Strict works where pipelined did not: stick to it for this session
+        _LOGGER.info("[%s] Disabling pipelined login for this session", self.username)
+        self.pipelined = False
+        return data
 
-    async def get_data(self) -> dict:
-        """Login through WebSocket and parse the SessionCli JSON."""
-        _LOGGER.debug("[%s] Connecting to %s", self.username, self.URL)
+    async def _fetch(
+        self, pipelined: bool, history_since: dict[str, str | None] | None
+    ) -> dict:
+        """Run one login over a fresh socket, timing it by login mode."""
+        mode = "pipelined" if pipelined else "strict"
+        _LOGGER.debug("[%s] Connecting to %s (%s login)", self.username, self.URL, mode)
+        started = time.monotonic()
 
         try:
             async with websockets.connect(
@@ -39,54 +136,207 @@ class TellinkAPI:
                 ping_interval=None,
                 close_timeout=5,
             ) as ws:
+                cred = json.dumps(
+                    {
+                        "tag": "Credentials",
+                        "username": self.username,
+                        "password": self.password,
+                    }
+                )
+                if pipelined:
+                    await ws.send(cred)
+                    _LOGGER.debug("[%s] Sent credentials payload", self.username)
+
                 # Wait for Challenge
                 try:
                     challenge_msg = await asyncio.wait_for(ws.recv(), timeout=5)
                     _LOGGER.debug(
                         "[%s] Received challenge: %s", self.username, challenge_msg
                     )
+                except asyncio.TimeoutError as err:
+                    raise TellinkTimeoutError("Timeout waiting for challenge") from err
+                except ConnectionClosed as err:
+                    if pipelined:
+                        raise _EarlyCredentialsRefused(
+                            f"Connection closed before challenge: {err}"
+                        ) from err
+                    raise
+
+                if pipelined:
+                    self._check_challenge(challenge_msg)
+                else:
+                    await ws.send(cred)
+                    _LOGGER.debug("[%s] Sent credentials payload", self.username)
+
+                data = await self._wait_for_session(ws)
+                elapsed = time.monotonic() - started
+                self.login_seconds[mode].append(elapsed)
+                _LOGGER.debug(
+                    "[%s] %s login completed in %.3f s",
+                    self.username,
+                    mode.capitalize(),
+                    elapsed,
+                )
+
+                if history_since is not None:
+                    data["history"] = await self._fetch_history(ws, history_since)
+
+        except TellinkError:
+            raise
+        except asyncio.TimeoutError as err:
+            raise TellinkTimeoutError("Timeout connecting to Tellink") from err
+        except (WebSocketException, OSError) as err:
+            raise TellinkConnectionError(f"WebSocket error: {err}") from err
+
+        return data
+
+    def _check_challenge(self, msg) -> None:
+        """Make sure the first frame after early credentials is still the challenge."""
+        try:
+            data = json.loads(msg)
+        except (TypeError, json.JSONDecodeError):
+            return
+        if not isinstance(data, dict):
+            return
+
+        tag = str(data.get("tag", ""))
+        if tag in AUTH_REJECT_TAGS:
+            raise _EarlyCredentialsRefused(f"Early credentials rejected ({tag})")
+        if tag in ("SessionCli", "Credentials"):
+            raise _EarlyCredentialsRefused(f"Expected challenge, got {tag} first")
+
+    async def _wait_for_session(self, ws) -> dict:
+        """Read frames until SessionCli arrives, classifying anything else."""
+        received = 0
+        for _ in range(20):
+            try:
+                msg = await asyncio.wait_for(ws.recv(), timeout=5)
+            except asyncio.TimeoutError:
+                continue
+            except ConnectionClosed as err:
+                raise _closed_error(err, "after credentials") from err
+            received += 1
+
+            try:
+                data = json.loads(msg)
+            except json.JSONDecodeError:
+                _LOGGER.debug("[%s] Ignoring non-JSON frame", self.username)
+                continue
+            if not isinstance(data, dict):
+                continue
+
+            tag = str(data.get("tag", ""))
+            if tag == "SessionCli":
+                return self._parse_session_cli(data)
+            if tag in AUTH_REJECT_TAGS:
+                raise TellinkAuthError(f"Login rejected by portal ({tag})")
+            _LOGGER.debug("[%s] Ignoring frame with tag %s", self.username, tag)
+
+        if not received:
+            raise TellinkTimeoutError("Timeout waiting for SessionCli")
+        raise TellinkProtocolError(
+            f"No SessionCli among {received} frames received after login"
+        )
+
+    async def _fetch_history(
+        self, ws, history_since: dict[str, str | None]
+    ) -> dict[str, list[list]]:
+        """Request history records from each cursor onwards.
+
+        History is best effort: a kind the portal does not answer for is
+        returned empty, and a dropped socket returns no history at all, so
+        the balance already parsed is never lost. All kinds are requested
+        up front and share one HISTORY_TIMEOUT.
+        """
+        pending = {
+            HISTORY_FRAMES[kind][1]: kind
+            for kind in history_since
+            if kind in HISTORY_FRAMES
+        }
+        history: dict[str, list[list]] = {kind: [] for kind in pending.values()}
+
+        try:
+            for kind in pending.values():
+                request_tag = HISTORY_FRAMES[kind][0]
+                await ws.send(
+                    json.dumps({"tag": request_tag, "since": history_since[kind]})
+                )
+
+            deadline = time.monotonic() + HISTORY_TIMEOUT
+            while pending and (remaining := deadline - time.monotonic()) > 0:
+                try:
+                    msg = await asyncio.wait_for(ws.recv(), timeout=remaining)
                 except asyncio.TimeoutError:
-                    _LOGGER.warning("[%s] Timeout waiting for challenge", self.username)
-                    return {}
-
-                # Send credentials
-                cred = {
-                    "tag": "Credentials",
-                    "username": self.username,
-                    "password": self.password,
-                }
-                await ws.send(json.dumps(cred))
-                _LOGGER.debug("[%s] Sent credentials payload", self.username)
-
-                # Wait for SessionCli
-                for _ in range(20):
-                    try:
-                        msg = await asyncio.wait_for(ws.recv(), timeout=5)
-                    except asyncio.TimeoutError:
-                        continue
-
-                    try:
-                        data = json.loads(msg)
-                    except json.JSONDecodeError:
-                        continue
-
-                    if data.get("tag") == "SessionCli":
-                        return self._parse_session_cli(data)
-
-        except (ConnectionClosedError, WebSocketException) as err:
-            _LOGGER.error("[%s] WebSocket error: %s", self.username, err)
-        except Exception as err:
-            _LOGGER.exception("[%s] Unexpected error: %s", self.username, err)
+                    break
+                try:
+                    frame = json.loads(msg)
+                except json.JSONDecodeError:
+                    continue
+                if not isinstance(frame, dict) or frame.get("tag") not in pending:
+                    continue
+
+                contents = frame.get("contents")
+                if not isinstance(contents, list):
+                    # Malformed answer: treat it like no answer for this kind
+                    _LOGGER.debug(
+                        "[%s] Ignoring %s frame without a record list",
+                        self.username,
+                        frame["tag"],
+                    )
+                    continue
+
+                kind = pending.pop(frame["tag"])
+                history[kind] = [
+                    record
+                    for raw in contents
+                    if (record := self._parse_history_record(raw, kind))
+                ]
+                _LOGGER.debug(
+                    "[%s] Received %d %s records",
+                    self.username,
+                    len(history[kind]),
+                    kind,
+                )
+        except (WebSocketException, OSError) as err:
+            _LOGGER.warning(
+                "[%s] History fetch failed, keeping balance only: %s",
+                self.username,
+                err,
+            )
+            return {}
 
-        _LOGGER.warning("[%s] Did not receive valid SessionCli JSON", self.username)
-        return {}
+        for kind in pending.values():
+            _LOGGER.debug("[%s] No %s history received", self.username, kind)
+        return history
+
+    @staticmethod
+    def _parse_history_record(raw, kind: str) -> list | None:
+        """Compact one history record to [datetime, category, amount].
+
+        The datetime is returned as the portal sent it (naive or aware);
+        the history store normalizes it to UTC.
+        """
+        if not isinstance(raw, dict):
+            return None
+
+        def first(keys):
+            return next((raw[k] for k in keys if raw.get(k) is not None), None)
+
+        try:
+            timestamp = datetime.fromisoformat(str(first(_HISTORY_DATE_KEYS)))
+            amount = round(float(first(_HISTORY_AMOUNT_KEYS)), 4)
+        except (TypeError, ValueError):
+            return None
+
+        category = kind if kind == "topup" else first(_HISTORY_CATEGORY_KEYS)
+        return [timestamp, str(category or "other").lower(), amount]
 
     def _parse_session_cli(self, data: dict) -> dict:
         """Extract balance, status, username, and expiry info."""
         try:
             contents = data.get("contents", [])
             if not contents or not isinstance(contents[0], dict):
-                return {}
+                raise TellinkProtocolError("SessionCli has no account contents")
 
             cli = contents[0]
             balance = round(float(cli.get("wcliCredit", 0.0)), 2)
@@ -109,6 +359,7 @@ class TellinkAPI:
                 "username": username,
                 "expiry": expiry_str,
             }
+        except TellinkProtocolError:
+            raise
         except Exception as err:
-            _LOGGER.warning("[%s] Error parsing SessionCli: %s", self.username, err)
-            return {}
+            raise TellinkProtocolError(f"Error parsing SessionCli: {err}") from err
@@ -7,16 +7,27 @@ import voluptuous as vol
 
 from homeassistant import config_entries
 from homeassistant.data_entry_flow import FlowResult
-from homeassistant.helpers import issue_registry as ir
 
-from .const import DOMAIN
-from .api import TellinkAPI
+from .const import (
+    DEFAULT_FETCH_HISTORY,
+    DEFAULT_MAX_STALE_AGE,
+    DEFAULT_PIPELINED_LOGIN,
+    DEFAULT_RETRY_INTERVAL,
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+)
+from .api import (
+    TellinkAPI,
+    TellinkAuthError,
+    TellinkConnectionError,
+    TellinkProtocolError,
+    TellinkTimeoutError,
+)
 from .credentials import get_credential_store
+from .repairs import delete_reauth_issue
 
 _LOGGER = logging.getLogger(__name__)
 
-ISSUE_ID_REAUTH = "reauth_required"
-
 
 class TellinkConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle the Tellink config flow."""
@@ -37,24 +48,31 @@ class TellinkConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
             try:
                 _LOGGER.debug("Validating Tellink credentials for %s", username)
-                data = await api.get_data()
-                if not data:
-                    errors["base"] = "invalid_auth"
-                else:
-                    await self.async_set_unique_id(username.lower())
-                    self._abort_if_unique_id_configured()
-
-                    # Store password temporarily; migration will move it to private storage (v4)
-                    return self.async_create_entry(
-                        title=f"Tellink ({username})",
-                        data={"username": username, "password": password},
-                        options={"scan_interval": 3600, "retry_interval": 3600},
-                    )
-            except TimeoutError:
+                await api.get_data()
+            except TellinkAuthError:
+                errors["base"] = "invalid_auth"
+            except (TellinkTimeoutError, TellinkConnectionError):
                 errors["base"] = "cannot_connect"
+            except TellinkProtocolError:
+                _LOGGER.warning("Unexpected response from Tellink for %s", username)
+                errors["base"] = "invalid_response"
             except Exception:
                 _LOGGER.exception("Unexpected error validating Tellink credentials")
                 errors["base"] = "unknown"
+            else:
+                await self.async_set_unique_id(username.lower())
+                self._abort_if_unique_id_configured()
+
+                # Store password temporarily; migration will move it to private storage (v4)
+                return self.async_create_entry(
+                    title=f"Tellink ({username})",
+                    data={"username": username, "password": password},
+                    options={
+                        "scan_interval": DEFAULT_SCAN_INTERVAL,
+                        "retry_interval": DEFAULT_RETRY_INTERVAL,
+                        "max_stale_age": DEFAULT_MAX_STALE_AGE,
+                    },
+                )
 
         data_schema = vol.Schema(
             {
@@ -102,23 +120,29 @@ class TellinkConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 _LOGGER.debug(
                     "Validating Tellink credentials during reauth for %s", username
                 )
-                data = await api.get_data()
-                if not data:
-                    errors["base"] = "invalid_auth"
-                else:
-                    # Save to private credential store and clear the Repairs issue
-                    cred_store = get_credential_store(self.hass)
-                    await cred_store.async_save(
-                        self._reauth_entry.entry_id, username, password
-                    )
-                    ir.async_delete_issue(self.hass, DOMAIN, ISSUE_ID_REAUTH)
-                    # Finish reauth successfully
-                    return self.async_abort(reason="reauth_successful")
-            except TimeoutError:
+                await api.get_data()
+            except TellinkAuthError:
+                errors["base"] = "invalid_auth"
+            except (TellinkTimeoutError, TellinkConnectionError):
                 errors["base"] = "cannot_connect"
+            except TellinkProtocolError:
+                _LOGGER.warning("Unexpected response from Tellink for %s", username)
+                errors["base"] = "invalid_response"
             except Exception:
                 _LOGGER.exception("Unexpected error during reauth")
                 errors["base"] = "unknown"
+            else:
+                # Save to private credential store and clear the Repairs issue
+                cred_store = get_credential_store(self.hass)
+                await cred_store.async_save(
+                    self._reauth_entry.entry_id, username, password
+                )
+                delete_reauth_issue(self.hass, self._reauth_entry.entry_id)
+                # Polling stopped on the auth failure; reload to resume it
+                await self.hass.config_entries.async_reload(
+                    self._reauth_entry.entry_id
+                )
+                return self.async_abort(reason="reauth_successful")
 
         schema = vol.Schema(
             {
@@ -134,7 +158,7 @@ class TellinkConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
 
 # ----------------------------------------------------------------------
-# Options Flow (scan_interval / retry_interval)
+# Options Flow (intervals / pipelined_login / fetch_history)
 # ----------------------------------------------------------------------
 
 
@@ -153,11 +177,25 @@ class TellinkOptionsFlowHandler(config_entries.OptionsFlow):
         schema = vol.Schema(
             {
                 vol.Required(
-                    "scan_interval", default=current.get("scan_interval", 3600)
+                    "scan_interval",
+                    default=current.get("scan_interval", DEFAULT_SCAN_INTERVAL),
                 ): int,
                 vol.Required(
-                    "retry_interval", default=current.get("retry_interval", 3600)
+                    "retry_interval",
+                    default=current.get("retry_interval", DEFAULT_RETRY_INTERVAL),
                 ): int,
+                vol.Required(
+                    "max_stale_age",
+                    default=current.get("max_stale_age", DEFAULT_MAX_STALE_AGE),
+                ): int,
+                vol.Required(
+                    "pipelined_login",
+                    default=current.get("pipelined_login", DEFAULT_PIPELINED_LOGIN),
+                ): bool,
+                vol.Required(
+                    "fetch_history",
+                    default=current.get("fetch_history", DEFAULT_FETCH_HISTORY),
+                ): bool,
             }
         )
         return self.async_show_form(step_id="init", data_schema=schema)
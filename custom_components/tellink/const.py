@@ -1 +1,12 @@
 DOMAIN = "tellink"
+
+ISSUE_ID_REAUTH = "reauth_required"
+
+DEFAULT_SCAN_INTERVAL = 3600
+DEFAULT_RETRY_INTERVAL = 3600
+DEFAULT_PIPELINED_LOGIN = False
+DEFAULT_FETCH_HISTORY = False
+DEFAULT_MAX_STALE_AGE = 7200
+
+# Options that can be applied to a running coordinator; anything else reloads the entry
+LIVE_OPTIONS = ("scan_interval", "retry_interval", "max_stale_age")
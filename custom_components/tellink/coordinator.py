@@ -0,0 +1,226 @@
+"""Data update coordinator for the Tellink Prepaid integration."""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Mapping
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
+
+from .api import TellinkAPI, TellinkAuthError, TellinkError, TellinkProtocolError
+from .const import (
+    DEFAULT_FETCH_HISTORY,
+    DEFAULT_MAX_STALE_AGE,
+    DEFAULT_RETRY_INTERVAL,
+    DEFAULT_SCAN_INTERVAL,
+    LIVE_OPTIONS,
+)
+from .history import get_history_store
+from .repairs import create_reauth_issue
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _reload_snapshot(entry: ConfigEntry) -> tuple[dict[str, Any], dict[str, Any]]:
+    """Return the parts of an entry that can only be applied by a full reload."""
+    options = {k: v for k, v in entry.options.items() if k not in LIVE_OPTIONS}
+    return dict(entry.data), options
+
+
+class TellinkCoordinator(DataUpdateCoordinator[dict]):
+    """Poll one Tellink account, switching between scan and retry intervals."""
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, api: TellinkAPI) -> None:
+        self.api = api
+        self.username = api.username
+        self.fetch_history = entry.options.get("fetch_history", DEFAULT_FETCH_HISTORY)
+        self._history = get_history_store(hass)
+        self.scan_interval = timedelta(seconds=DEFAULT_SCAN_INTERVAL)
+        self.retry_interval = timedelta(seconds=DEFAULT_RETRY_INTERVAL)
+        self.max_stale_age = timedelta(seconds=DEFAULT_MAX_STALE_AGE)
+        self._read_options(entry.options)
+        self._snapshot = _reload_snapshot(entry)
+        # Time of the last successful fetch, used to serve stale data on failures
+        self.last_success_time: datetime | None = None
+        self._unsub_stale_expiry: CALLBACK_TYPE | None = None
+        # Protocol errors back off on scan_interval, other failures on retry_interval
+        self._protocol_failure = False
+
+        super().__init__(
+            hass,
+            _LOGGER,
+            config_entry=entry,
+            name=f"tellink_{self.username}",
+            update_interval=self.scan_interval,
+        )
+
+    def _read_options(self, options: Mapping[str, Any]) -> None:
+        self.scan_interval = timedelta(
+            seconds=options.get("scan_interval", DEFAULT_SCAN_INTERVAL)
+        )
+        self.retry_interval = timedelta(
+            seconds=options.get("retry_interval", DEFAULT_RETRY_INTERVAL)
+        )
+        self.max_stale_age = timedelta(
+            seconds=options.get("max_stale_age", DEFAULT_MAX_STALE_AGE)
+        )
+
+    @property
+    def data_age(self) -> timedelta | None:
+        """Return how old the current data is, or None before the first success."""
+        if self.last_success_time is None:
+            return None
+        return dt_util.utcnow() - self.last_success_time
+
+    @property
+    def serving_stale(self) -> bool:
+        """Return True while failed refreshes are covered by recent enough data."""
+        age = self.data_age
+        return (
+            not self.last_update_success
+            and self.data is not None
+            and age is not None
+            and age <= self.max_stale_age
+        )
+
+    async def _async_update_data(self) -> dict:
+        """Fetch data, keeping track of its age for stale serving."""
+        try:
+            data = await self._async_fetch()
+        except Exception:
+            self._arm_stale_expiry()
+            raise
+
+        self.last_success_time = dt_util.utcnow()
+        self._cancel_stale_expiry()
+        return data
+
+    async def _async_fetch(self) -> dict:
+        """Fetch data from Tellink, scheduling the next attempt by failure class."""
+        try:
+            _LOGGER.debug("[%s] Fetching Tellink data", self.username)
+            history_since = None
+            if self.fetch_history:
+                history_since = await self._history.async_get_cursors(
+                    self.config_entry.entry_id
+                )
+            data = await self.api.get_data(history_since)
+        except TellinkAuthError as err:
+            # Retrying with the same password only risks locking the account;
+            # HA stops polling and starts reauth on ConfigEntryAuthFailed
+            _LOGGER.error("[%s] Credentials rejected: %s", self.username, err)
+            create_reauth_issue(self.hass, self.config_entry, self.username)
+            raise ConfigEntryAuthFailed(str(err)) from err
+        except TellinkProtocolError as err:
+            # The portal changed its payload; hammering it won't help
+            _LOGGER.error(
+                "[%s] Unexpected response from Tellink: %s; retrying in %s s",
+                self.username,
+                err,
+                self.scan_interval.total_seconds(),
+            )
+            self._protocol_failure = True
+            self.update_interval = self.scan_interval
+            raise UpdateFailed(err) from err
+        except TellinkError as err:
+            _LOGGER.warning(
+                "[%s] Update failed: %s; retrying in %s s",
+                self.username,
+                err,
+                self.retry_interval.total_seconds(),
+            )
+            self._protocol_failure = False
+            self.update_interval = self.retry_interval
+            raise UpdateFailed(err) from err
+
+        if self.fetch_history:
+            await self._update_history(data)
+
+        self.update_interval = self.scan_interval
+        return data
+
+    async def _update_history(self, data: dict) -> None:
+        """Store the fetched history delta and add this month's spend per category."""
+        entry_id = self.config_entry.entry_id
+        await self._history.async_append(entry_id, data.pop("history", {}))
+        month_start = dt_util.start_of_local_day().replace(day=1)
+        data["spend"] = self._history.spend_by_category(entry_id, month_start)
+        # Spend sensors report this as last_reset so it always matches the totals
+        data["spend_since"] = month_start
+
+    @callback
+    def _arm_stale_expiry(self) -> None:
+        """Notify entities when the data they are still showing gets too old."""
+        self._cancel_stale_expiry()
+        age = self.data_age
+        if age is None or age > self.max_stale_age:
+            return
+        remaining = (self.max_stale_age - age).total_seconds()
+        _LOGGER.debug(
+            "[%s] Serving data from %s s ago for up to %s s more",
+            self.username,
+            int(age.total_seconds()),
+            int(remaining),
+        )
+        self._unsub_stale_expiry = async_call_later(
+            self.hass, remaining, self._handle_stale_expiry
+        )
+
+    @callback
+    def _cancel_stale_expiry(self) -> None:
+        if self._unsub_stale_expiry:
+            self._unsub_stale_expiry()
+            self._unsub_stale_expiry = None
+
+    @callback
+    def _handle_stale_expiry(self, _now: datetime) -> None:
+        self._unsub_stale_expiry = None
+        _LOGGER.debug("[%s] Cached data exceeded max stale age", self.username)
+        self.async_update_listeners()
+
+    async def async_shutdown(self) -> None:
+        """Cancel the stale expiry timer along with the refresh timer."""
+        self._cancel_stale_expiry()
+        await super().async_shutdown()
+
+    def requires_reload(self, entry: ConfigEntry) -> bool:
+        """Return True if the entry changed in a way the running coordinator can't absorb."""
+        return _reload_snapshot(entry) != self._snapshot
+
+    @callback
+    def async_apply_options(self, options: Mapping[str, Any]) -> None:
+        """Apply new intervals and max stale age without logging in again."""
+        self._read_options(options)
+        if self.last_update_success or self._protocol_failure:
+            self.update_interval = self.scan_interval
+        else:
+            self.update_interval = self.retry_interval
+
+        if not self.last_update_success:
+            self._arm_stale_expiry()
+            self.async_update_listeners()
+
+        if isinstance(self.last_exception, ConfigEntryAuthFailed):
+            # HA stopped polling on the rejected password; only reauth resumes it
+            _LOGGER.debug(
+                "[%s] Applied options; polling stays paused until reauth",
+                self.username,
+            )
+            return
+
+        _LOGGER.debug(
+            "[%s] Applied options: next refresh in %s s",
+            self.username,
+            self.update_interval.total_seconds(),
+        )
+        # Deliberately uses the base class internals: there is no public way to
+        # re-arm the refresh timer without triggering an immediate login
+        if self._listeners:
+            self._schedule_refresh()
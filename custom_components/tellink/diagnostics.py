@@ -0,0 +1,55 @@
+"""Diagnostics support for Tellink (login latency per mode, polling state)."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+TO_REDACT = {"username", "password"}
+
+
+def _login_stats(samples) -> dict[str, Any]:
+    """Summarize recent login durations for one mode."""
+    if not samples:
+        return {"count": 0}
+    return {
+        "count": len(samples),
+        "mean_seconds": round(sum(samples) / len(samples), 3),
+        "min_seconds": round(min(samples), 3),
+        "max_seconds": round(max(samples), 3),
+        "last_seconds": round(samples[-1], 3),
+    }
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    api = coordinator.api
+    age = coordinator.data_age
+
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "login": {
+            "pipelined": api.pipelined,
+            "modes": {
+                mode: _login_stats(samples)
+                for mode, samples in api.login_seconds.items()
+            },
+        },
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": coordinator.update_interval.total_seconds(),
+            "data_age": int(age.total_seconds()) if age is not None else None,
+            "serving_stale": coordinator.serving_stale,
+        },
+    }
@@ -0,0 +1,112 @@
+"""Local usage/top-up history cache for Tellink using Home Assistant Store."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .api import HISTORY_FRAMES
+
+STORAGE_VERSION = 1
+STORAGE_KEY = "tellink_history"
+
+# Records older than this are dropped from the cache
+RETENTION = timedelta(days=400)
+SAVE_DELAY = 30
+
+
+class HistoryStore:
+    """Keep compact history records and a fetch cursor per entry_id.
+
+    Layout per entry: {"cursor": {kind: iso}, kind: [[iso, category, amount], ...]}
+    with every iso timestamp in UTC.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._cache: Dict[str, Dict[str, Any]] | None = None
+
+    async def _ensure_loaded(self) -> Dict[str, Dict[str, Any]]:
+        if self._cache is None:
+            self._cache = await self._store.async_load() or {}
+        return self._cache
+
+    async def async_get_cursors(self, entry_id: str) -> Dict[str, Optional[str]]:
+        """Return the newest stored timestamp per history kind."""
+        data = await self._ensure_loaded()
+        cursors = data.get(entry_id, {}).get("cursor", {})
+        return {kind: cursors.get(kind) for kind in HISTORY_FRAMES}
+
+    async def async_append(
+        self, entry_id: str, history: Dict[str, List[list]]
+    ) -> None:
+        """Merge newly fetched records, advance cursors and prune old ones.
+
+        Timestamps are stored as UTC ISO strings so they compare correctly
+        as text. Records at the cursor timestamp are deduplicated on the
+        whole record, so a second record sharing that timestamp is kept.
+        """
+        data = await self._ensure_loaded()
+        account = data.setdefault(entry_id, {"cursor": {}})
+        cutoff = (dt_util.utcnow() - RETENTION).isoformat()
+        changed = False
+
+        for kind, records in history.items():
+            cursor = account["cursor"].get(kind)
+            stored = account.get(kind, [])
+            seen = {tuple(r) for r in stored if cursor is not None and r[0] >= cursor}
+            new = []
+            for timestamp, category, amount in records:
+                record = [dt_util.as_utc(timestamp).isoformat(), category, amount]
+                if record[0] < cutoff or (cursor is not None and record[0] < cursor):
+                    continue
+                if tuple(record) in seen:
+                    continue
+                seen.add(tuple(record))
+                new.append(record)
+
+            kept = [r for r in stored if r[0] >= cutoff]
+            if not new and len(kept) == len(stored):
+                continue
+            account[kind] = sorted(kept + new)
+            if account[kind]:
+                account["cursor"][kind] = account[kind][-1][0]
+            changed = True
+
+        if changed:
+            self._store.async_delay_save(lambda: self._cache or {}, SAVE_DELAY)
+
+    @callback
+    def spend_by_category(self, entry_id: str, since: datetime) -> Dict[str, float]:
+        """Sum usage amounts per category from the given time onwards."""
+        totals: Dict[str, float] = {}
+        if self._cache is None:
+            return totals
+        start = dt_util.as_utc(since).isoformat()
+        for timestamp, category, amount in self._cache.get(entry_id, {}).get(
+            "usage", []
+        ):
+            if timestamp >= start:
+                totals[category] = round(totals.get(category, 0.0) + amount, 2)
+        return totals
+
+    async def async_delete(self, entry_id: str) -> None:
+        data = await self._ensure_loaded()
+        if entry_id in data:
+            data.pop(entry_id)
+            await self._store.async_save(data)
+
+
+def get_history_store(hass: HomeAssistant) -> HistoryStore:
+    """Get a singleton history store instance."""
+    key = "_tellink_history_store"
+    store: HistoryStore | None = hass.data.get(key)  # type: ignore[assignment]
+    if store is None:
+        store = HistoryStore(hass)
+        hass.data[key] = store
+    return store
@@ -5,6 +5,7 @@ from __future__ import annotations
 import logging
 import voluptuous as vol
 
+from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import issue_registry as ir
 from homeassistant.helpers.selector import (
@@ -14,13 +15,54 @@ from homeassistant.helpers.selector import (
 )
 from homeassistant.components.repairs import RepairsFlow
 
-from .const import DOMAIN
-from .api import TellinkAPI
+from .const import DOMAIN, ISSUE_ID_REAUTH
+from .api import (
+    TellinkAPI,
+    TellinkAuthError,
+    TellinkConnectionError,
+    TellinkProtocolError,
+    TellinkTimeoutError,
+)
 from .credentials import get_credential_store
 
 _LOGGER = logging.getLogger(__name__)
 
-ISSUE_ID_REAUTH = "reauth_required"
+
+# ----------------------------------------------------------------------
+# Helpers: Repairs (issue registry)
+# ----------------------------------------------------------------------
+
+
+def create_reauth_issue(
+    hass: HomeAssistant, entry: ConfigEntry, username: str | None
+) -> None:
+    """Create a Repairs issue to guide the user to reauthenticate (with Fix button)."""
+    ir.async_create_issue(
+        hass,
+        DOMAIN,
+        reauth_issue_id(entry.entry_id),
+        is_fixable=True,
+        severity=ir.IssueSeverity.ERROR,
+        translation_key="reauth_required",
+        translation_placeholders={
+            "entry_title": entry.title or "Tellink",
+            "username": username or "unknown",
+        },
+        # This 'data' block is passed to our repairs fix flow so we know which entry to fix
+        data={"entry_id": entry.entry_id, "username": username or "unknown"},
+        learn_more_url="https://my.home-assistant.io/redirect/config_flow_start?domain=tellink",
+    )
+
+
+def reauth_issue_id(entry_id: str) -> str:
+    """Return the Repairs issue id for one entry, so entries never clear each other's issue."""
+    return f"{ISSUE_ID_REAUTH}_{entry_id}"
+
+
+def delete_reauth_issue(hass: HomeAssistant, entry_id: str) -> None:
+    """Delete the entry's reauth issue (and the pre-per-entry shared one) if present."""
+    ir.async_delete_issue(hass, DOMAIN, reauth_issue_id(entry_id))
+    ir.async_delete_issue(hass, DOMAIN, ISSUE_ID_REAUTH)
 
 
 class TellinkRepairFlow(RepairsFlow):
@@ -47,30 +89,33 @@ class TellinkRepairFlow(RepairsFlow):
             # Validate credentials via API
             try:
                 api = TellinkAPI(self._username, password)
-                data = await api.get_data()
-                if not data:
-                    errors["base"] = "invalid_auth"
-                else:
-                    # Save into private credential store
-                    cred_store = get_credential_store(self.hass)
-                    await cred_store.async_save(
-                        self._entry_id, self._username, password
-                    )
-
-                    # Clear the issue and reload the entry
-                    ir.async_delete_issue(self.hass, DOMAIN, ISSUE_ID_REAUTH)
-                    entry = self.hass.config_entries.async_get_entry(self._entry_id)
-                    if entry:
-                        await self.hass.config_entries.async_reload(self._entry_id)
-
-                    return self.async_create_entry(
-                        title="Reauthentication successful", data={}
-                    )
-            except TimeoutError:
+                await api.get_data()
+            except TellinkAuthError:
+                errors["base"] = "invalid_auth"
+            except (TellinkTimeoutError, TellinkConnectionError):
                 errors["base"] = "cannot_connect"
+            except TellinkProtocolError:
+                _LOGGER.warning(
+                    "Unexpected response from Tellink for %s", self._username
+                )
+                errors["base"] = "invalid_response"
             except Exception:  # noqa: BLE001
                 _LOGGER.exception("Unexpected error during Tellink repairs reauth")
                 errors["base"] = "unknown"
+            else:
+                # Save into private credential store
+                cred_store = get_credential_store(self.hass)
+                await cred_store.async_save(self._entry_id, self._username, password)
+
+                # Clear the issue and reload the entry
+                delete_reauth_issue(self.hass, self._entry_id)
+                entry = self.hass.config_entries.async_get_entry(self._entry_id)
+                if entry:
+                    await self.hass.config_entries.async_reload(self._entry_id)
+
+                return self.async_create_entry(
+                    title="Reauthentication successful", data={}
+                )
 
         # Use HA selectors for a password-style field (hidden entry)
         schema = vol.Schema(
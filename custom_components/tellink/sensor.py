@@ -4,10 +4,15 @@ from __future__ import annotations
 
 import logging
 from datetime import datetime, date
-from homeassistant.components.sensor import SensorEntity, SensorDeviceClass
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import slugify
 
 from .const import DOMAIN
 
@@ -36,6 +41,23 @@ async def async_setup_entry(
     ]
     async_add_entities(entities)
 
+    # Spend sensors appear as categories show up in the fetched history
+    known_categories: set[str] = set()
+
+    @callback
+    def _async_add_spend_sensors() -> None:
+        spend = (coordinator.data or {}).get("spend") or {}
+        new = [c for c in spend if c not in known_categories]
+        if not new:
+            return
+        known_categories.update(new)
+        async_add_entities(
+            TellinkSpendSensor(coordinator, username, category) for category in new
+        )
+
+    _async_add_spend_sensors()
+    entry.async_on_unload(coordinator.async_add_listener(_async_add_spend_sensors))
+
 
 # ----------------------------------------------------------------------
 # Base class
@@ -57,6 +79,20 @@ class BaseTellinkSensor(CoordinatorEntity, SensorEntity):
         """Shortcut to coordinator data."""
         return self.coordinator.data or {}
 
+    @property
+    def available(self) -> bool:
+        """Stay available on the last good data until it exceeds the max stale age."""
+        return super().available or self.coordinator.serving_stale
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Expose how old the shown data is and whether refreshes are failing."""
+        age = self.coordinator.data_age
+        return {
+            "data_age": int(age.total_seconds()) if age is not None else None,
+            "stale": not self.coordinator.last_update_success,
+        }
+
 
 # ----------------------------------------------------------------------
 # Individual sensors
@@ -143,3 +179,28 @@ class TellinkExpirySensor(BaseTellinkSensor):
                 "[%s] Could not parse expiry value: %s", self._username, expiry_value
             )
             return None
+
+
+class TellinkSpendSensor(BaseTellinkSensor):
+    """Representation of this month's spend in one usage category."""
+
+    _attr_native_unit_of_measurement = "€"
+    _attr_device_class = SensorDeviceClass.MONETARY
+    _attr_state_class = SensorStateClass.TOTAL
+
+    def __init__(self, coordinator, username, category: str):
+        super().__init__(
+            coordinator, username, f"Spend {category}", "mdi:cash-minus"
+        )
+        self._category = category
+        self._attr_unique_id = f"tellink_spend_{slugify(category)}_{username}"
+
+    @property
+    def native_value(self) -> float:
+        """Return the amount spent in this category since the start of the month."""
+        return (self.data.get("spend") or {}).get(self._category, 0.0)
+
+    @property
+    def last_reset(self) -> datetime | None:
+        """Return the month start the current totals were summed from."""
+        return self.data.get("spend_since")
@@ -0,0 +1 @@
+"""Tests for the Tellink Prepaid integration."""
@@ -0,0 +1,71 @@
+"""Fixtures for Tellink tests."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.tellink.api import (
+    TellinkAuthError,
+    TellinkProtocolError,
+    TellinkTimeoutError,
+)
+
+
+class FakeTellinkAPI:
+    """In-memory stand-in for TellinkAPI: no sockets, deterministic failures."""
+
+    # Usernames whose password the fake portal rejects
+    rejected: set[str] = set()
+    # When set, every 13th call is a protocol error and every 7th a timeout
+    inject_failures = False
+    calls = 0
+
+    def __init__(self, username: str, password: str, pipelined: bool = False):
+        self.username = username
+        self.password = password
+        self.pipelined = pipelined
+        self.login_seconds = {
+            "pipelined": deque(maxlen=20),
+            "strict": deque(maxlen=20),
+        }
+
+    async def get_data(self, history_since=None) -> dict:
+        cls = type(self)
+        cls.calls += 1
+        call = cls.calls
+        await asyncio.sleep(0)
+
+        if self.username in cls.rejected:
+            raise TellinkAuthError("Login rejected by portal (LoginFailed)")
+        if cls.inject_failures:
+            if call % 13 == 0:
+                raise TellinkProtocolError("No SessionCli among 1 frames")
+            if call % 7 == 0:
+                raise TellinkTimeoutError("Timeout waiting for SessionCli")
+
+        return {
+            "balance": round((call % 1000) / 10, 2),
+            "status": "Active",
+            "username": self.username,
+            "expiry": "2037-12-31",
+        }
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    """Let Home Assistant load custom_components/tellink."""
+    yield
+
+
+@pytest.fixture
+def fake_api():
+    """Replace TellinkAPI used by the integration setup with FakeTellinkAPI."""
+    FakeTellinkAPI.rejected = set()
+    FakeTellinkAPI.inject_failures = False
+    FakeTellinkAPI.calls = 0
+    with patch("custom_components.tellink.TellinkAPI", FakeTellinkAPI):
+        yield FakeTellinkAPI
@@ -0,0 +1,309 @@
+"""Tests for TellinkAPI failure classification, pipelined login and history."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+from websockets.exceptions import ConnectionClosedError, ConnectionClosedOK
+from websockets.frames import Close
+
+from custom_components.tellink.api import (
+    TellinkAPI,
+    TellinkAuthError,
+    TellinkConnectionError,
+    TellinkProtocolError,
+    TellinkTimeoutError,
+)
+
+CHALLENGE = {"tag": "Challenge", "contents": "nonce"}
+SESSION = {
+    "tag": "SessionCli",
+    "contents": [
+        {
+            "wcliCredit": "6.754",
+            "wcliStatus": "Active",
+            "wcliUsername": "user",
+            "wcliValidity": ["2030-01-01", "2037-12-31T00:00:00"],
+        }
+    ],
+}
+PARSED = {
+    "balance": 6.75,
+    "status": "Active",
+    "username": "user",
+    "expiry": "2037-12-31",
+}
+REJECTED = {"tag": "LoginFailed"}
+
+# recv() answers with the same TimeoutError asyncio.wait_for would raise after 5 s
+SILENCE = object()
+
+
+def _closed(code: int) -> ConnectionClosedOK | ConnectionClosedError:
+    close = Close(code, "")
+    if code in (1000, 1001):
+        return ConnectionClosedOK(close, None)
+    return ConnectionClosedError(close, None)
+
+
+class FakeSocket:
+    """Replay a scripted sequence of frames, exceptions and silences."""
+
+    def __init__(self, script: list, log: list) -> None:
+        self._script = list(script)
+        self._log = log
+        self.sent: list[dict] = []
+
+    async def recv(self) -> str:
+        if not self._script:
+            raise asyncio.TimeoutError
+        item = self._script.pop(0)
+        if item is SILENCE:
+            raise asyncio.TimeoutError
+        if isinstance(item, BaseException):
+            raise item
+        self._log.append(("recv", item.get("tag") if isinstance(item, dict) else item))
+        return json.dumps(item) if isinstance(item, dict) else item
+
+    async def send(self, message: str) -> None:
+        frame = json.loads(message)
+        self.sent.append(frame)
+        self._log.append(("send", frame["tag"]))
+
+
+class FakePortal:
+    """Stand-in for websockets.connect with one script per connection."""
+
+    def __init__(self, *scripts) -> None:
+        self._scripts = list(scripts)
+        self.sockets: list[FakeSocket] = []
+        self.log: list[tuple[str, str]] = []
+
+    def __call__(self, url: str, **kwargs) -> FakePortal:
+        script = self._scripts.pop(0)
+        if isinstance(script, BaseException):
+            raise script
+        self.sockets.append(FakeSocket(script, self.log))
+        return self
+
+    async def __aenter__(self) -> FakeSocket:
+        return self.sockets[-1]
+
+    async def __aexit__(self, *exc) -> None:
+        return None
+
+
+def _portal(*scripts) -> FakePortal:
+    return FakePortal(*scripts)
+
+
+async def _get_data(portal: FakePortal, api: TellinkAPI, **kwargs) -> dict:
+    with patch("custom_components.tellink.api.websockets.connect", portal):
+        return await api.get_data(**kwargs)
+
+
+# ----------------------------------------------------------------------
+# Strict login and failure classification
+# ----------------------------------------------------------------------
+
+
+async def test_strict_login_sends_credentials_after_challenge() -> None:
+    portal = _portal([CHALLENGE, SESSION])
+
+    assert await _get_data(portal, TellinkAPI("user", "pw")) == PARSED
+    assert portal.log == [
+        ("recv", "Challenge"),
+        ("send", "Credentials"),
+        ("recv", "SessionCli"),
+    ]
+    assert portal.sockets[0].sent[0]["password"] == "pw"
+
+
+async def test_rejection_tag_is_auth_error() -> None:
+    with pytest.raises(TellinkAuthError):
+        await _get_data(_portal([CHALLENGE, REJECTED]), TellinkAPI("user", "pw"))
+
+
+async def test_failure_like_tag_is_not_auth_error() -> None:
+    portal = _portal([CHALLENGE, {"tag": "PaymentFailed"}])
+
+    with pytest.raises(TellinkProtocolError):
+        await _get_data(portal, TellinkAPI("user", "pw"))
+
+
+@pytest.mark.parametrize(
+    ("code", "error"),
+    [
+        (1000, TellinkConnectionError),
+        (1001, TellinkConnectionError),
+        (1011, TellinkConnectionError),
+        (1008, TellinkAuthError),
+        (4401, TellinkAuthError),
+        (4403, TellinkAuthError),
+    ],
+)
+async def test_close_after_credentials_classified_by_code(code, error) -> None:
+    with pytest.raises(error):
+        await _get_data(_portal([CHALLENGE, _closed(code)]), TellinkAPI("user", "pw"))
+
+
+async def test_close_before_challenge_is_connection_error() -> None:
+    with pytest.raises(TellinkConnectionError):
+        await _get_data(_portal([_closed(1001)]), TellinkAPI("user", "pw"))
+
+
+async def test_silent_portal_is_timeout() -> None:
+    with pytest.raises(TellinkTimeoutError):
+        await _get_data(_portal([]), TellinkAPI("user", "pw"))
+
+
+async def test_silence_after_credentials_is_timeout() -> None:
+    with pytest.raises(TellinkTimeoutError):
+        await _get_data(_portal([CHALLENGE]), TellinkAPI("user", "pw"))
+
+
+@pytest.mark.parametrize(
+    "session",
+    [
+        {"tag": "SessionCli", "contents": []},
+        {"tag": "SessionCli", "contents": ["not a dict"]},
+        {"tag": "SessionCli", "contents": [{"wcliCredit": "n/a"}]},
+    ],
+)
+async def test_bad_session_payload_is_protocol_error(session) -> None:
+    with pytest.raises(TellinkProtocolError):
+        await _get_data(_portal([CHALLENGE, session]), TellinkAPI("user", "pw"))
+
+
+@pytest.mark.parametrize(
+    ("failure", "error"),
+    [
+        (OSError("unreachable"), TellinkConnectionError),
+        (asyncio.TimeoutError(), TellinkTimeoutError),
+    ],
+)
+async def test_connect_failures(failure, error) -> None:
+    with pytest.raises(error):
+        await _get_data(_portal(failure), TellinkAPI("user", "pw"))
+
+
+# ----------------------------------------------------------------------
+# Pipelined login
+# ----------------------------------------------------------------------
+
+
+async def test_pipelined_login_sends_credentials_first() -> None:
+    api = TellinkAPI("user", "pw", pipelined=True)
+    portal = _portal([CHALLENGE, SESSION])
+
+    assert await _get_data(portal, api) == PARSED
+    assert portal.log[0] == ("send", "Credentials")
+    assert len(portal.sockets) == 1
+    assert api.pipelined
+    assert len(api.login_seconds["pipelined"]) == 1
+
+
+@pytest.mark.parametrize(
+    "pipelined_script",
+    [
+        [CHALLENGE, REJECTED],
+        [CHALLENGE, SILENCE],
+        [REJECTED],
+        [SESSION],
+        [_closed(1000)],
+    ],
+    ids=["rejected-after-challenge", "silent", "rejected-first", "out-of-order", "closed"],
+)
+async def test_pipelined_falls_back_to_strict(pipelined_script) -> None:
+    api = TellinkAPI("user", "pw", pipelined=True)
+    portal = _portal(pipelined_script, [CHALLENGE, SESSION])
+
+    assert await _get_data(portal, api) == PARSED
+    assert len(portal.sockets) == 2
+    assert not api.pipelined
+    assert len(api.login_seconds["strict"]) == 1
+
+
+async def test_pipelined_wrong_password_fails_after_strict_retry() -> None:
+    api = TellinkAPI("user", "wrong", pipelined=True)
+    portal = _portal([CHALLENGE, REJECTED], [CHALLENGE, REJECTED])
+
+    with pytest.raises(TellinkAuthError):
+        await _get_data(portal, api)
+    assert len(portal.sockets) == 2
+    assert api.pipelined
+
+
+async def test_pipelined_strict_retry_timeout_is_reported() -> None:
+    api = TellinkAPI("user", "pw", pipelined=True)
+    portal = _portal([CHALLENGE], [CHALLENGE])
+
+    with pytest.raises(TellinkTimeoutError):
+        await _get_data(portal, api)
+    assert api.pipelined
+
+
+async def test_pipelined_protocol_error_is_not_retried() -> None:
+    api = TellinkAPI("user", "pw", pipelined=True)
+    portal = _portal([CHALLENGE, {"tag": "SessionCli", "contents": []}])
+
+    with pytest.raises(TellinkProtocolError):
+        await _get_data(portal, api)
+    assert len(portal.sockets) == 1
+    assert api.pipelined
+
+
+# ----------------------------------------------------------------------
+# History
+# ----------------------------------------------------------------------
+
+
+async def test_history_requested_with_cursors() -> None:
+    usage = {
+        "tag": "UsageHistoryCli",
+        "contents": [
+            {"date": "2026-10-01T08:00:00", "category": "Data", "amount": "1.5"},
+            {"date": "not a date", "category": "SMS", "amount": 1},
+            {"date": "2026-10-02T09:00:00+02:00", "type": "SMS", "cost": 0.1},
+        ],
+    }
+    topup = {
+        "tag": "TopupHistoryCli",
+        "contents": [{"timestamp": "2026-10-03T10:00:00", "amount": 10}],
+    }
+    portal = _portal([CHALLENGE, SESSION, usage, topup])
+    since = {"usage": "2026-09-30T00:00:00+00:00", "topup": None}
+
+    data = await _get_data(portal, TellinkAPI("user", "pw"), history_since=since)
+
+    assert {k: v for k, v in data.items() if k != "history"} == PARSED
+    sent = portal.sockets[0].sent
+    assert sent[1] == {"tag": "UsageHistory", "since": since["usage"]}
+    assert sent[2] == {"tag": "TopupHistory", "since": None}
+    assert [r[1:] for r in data["history"]["usage"]] == [["data", 1.5], ["sms", 0.1]]
+    assert data["history"]["topup"] == [[datetime(2026, 10, 3, 10), "topup", 10.0]]
+
+
+async def test_history_malformed_or_missing_answer_keeps_balance() -> None:
+    usage = {"tag": "UsageHistoryCli", "contents": 42}
+    portal = _portal([CHALLENGE, SESSION, usage])
+    since = {"usage": None, "topup": None}
+
+    data = await _get_data(portal, TellinkAPI("user", "pw"), history_since=since)
+
+    assert data["balance"] == PARSED["balance"]
+    assert data["history"] == {"usage": [], "topup": []}
+
+
+async def test_history_connection_drop_keeps_balance() -> None:
+    portal = _portal([CHALLENGE, SESSION, _closed(1011)])
+    since = {"usage": None, "topup": None}
+
+    data = await _get_data(portal, TellinkAPI("user", "pw"), history_since=since)
+
+    assert data["balance"] == PARSED["balance"]
+    assert data["history"] == {}
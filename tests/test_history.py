@@ -0,0 +1,98 @@
+"""Tests for the Tellink history cache."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.tellink.history import RETENTION, HistoryStore
+
+ENTRY_ID = "entry"
+
+
+def _utc(value: datetime) -> str:
+    return dt_util.as_utc(value).isoformat()
+
+
+async def _stored(store: HistoryStore, kind: str) -> list[list]:
+    return (await store._ensure_loaded())[ENTRY_ID].get(kind, [])
+
+
+async def test_same_timestamp_records_are_kept(hass: HomeAssistant) -> None:
+    store = HistoryStore(hass)
+    moment = dt_util.utcnow().replace(microsecond=0)
+
+    await store.async_append(ENTRY_ID, {"usage": [[moment, "data", 1.0]]})
+    await store.async_append(
+        ENTRY_ID, {"usage": [[moment, "data", 1.0], [moment, "sms", 0.5]]}
+    )
+
+    assert await _stored(store, "usage") == [
+        [_utc(moment), "data", 1.0],
+        [_utc(moment), "sms", 0.5],
+    ]
+    assert (await store.async_get_cursors(ENTRY_ID))["usage"] == _utc(moment)
+
+
+async def test_records_before_cursor_are_ignored(hass: HomeAssistant) -> None:
+    store = HistoryStore(hass)
+    now = dt_util.utcnow().replace(microsecond=0)
+
+    await store.async_append(ENTRY_ID, {"usage": [[now, "data", 1.0]]})
+    await store.async_append(
+        ENTRY_ID, {"usage": [[now - timedelta(hours=1), "data", 2.0]]}
+    )
+
+    assert await _stored(store, "usage") == [[_utc(now), "data", 1.0]]
+
+
+async def test_retention_cutoff(hass: HomeAssistant) -> None:
+    store = HistoryStore(hass)
+    now = dt_util.utcnow().replace(microsecond=0)
+    expired = now - RETENTION - timedelta(days=1)
+
+    # Expired records are neither stored when fetched nor kept once they age out
+    await store.async_append(ENTRY_ID, {"usage": [[expired, "data", 9.0]]})
+    assert await _stored(store, "usage") == []
+
+    store._cache[ENTRY_ID]["usage"] = [[_utc(expired), "data", 9.0]]
+    await store.async_append(ENTRY_ID, {"usage": [[now, "data", 1.0]]})
+    assert await _stored(store, "usage") == [[_utc(now), "data", 1.0]]
+
+
+async def test_naive_timestamps_stored_as_utc(hass: HomeAssistant) -> None:
+    store = HistoryStore(hass)
+    naive = datetime.now().replace(microsecond=0)
+    aware = naive.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE)
+
+    await store.async_append(ENTRY_ID, {"usage": [[naive, "data", 1.0]]})
+
+    [[stored, _, _]] = await _stored(store, "usage")
+    assert stored == dt_util.as_utc(aware).isoformat()
+    assert stored.endswith("+00:00")
+
+
+async def test_spend_includes_naive_record_at_month_start(
+    hass: HomeAssistant,
+) -> None:
+    store = HistoryStore(hass)
+    month_start = dt_util.start_of_local_day().replace(day=1)
+    naive_midnight = month_start.replace(tzinfo=None)
+
+    await store.async_append(
+        ENTRY_ID,
+        {
+            "usage": [
+                [naive_midnight - timedelta(seconds=1), "data", 5.0],
+                [naive_midnight, "data", 1.25],
+                [naive_midnight + timedelta(days=1), "sms", 0.5],
+            ]
+        },
+    )
+
+    assert store.spend_by_category(ENTRY_ID, month_start) == {
+        "data": 1.25,
+        "sms": 0.5,
+    }
@@ -0,0 +1,261 @@
+"""Soak test: many Tellink entries through setup, update fan-out, reloads and unloads.
+
+Reports event-loop lag percentiles, per-cycle allocations and retained memory,
+and fails on leaked coordinators, leftover bookkeeping or retained memory.
+
+Scale with TELLINK_SOAK_ENTRIES / TELLINK_SOAK_CYCLES; set TELLINK_SOAK_REPORT
+to a path to also write the report there. Run with ``pytest -s -m soak``.
+The setup-scaling check compares wall-clock timings, so it only fails the
+test when TELLINK_SOAK_STRICT=1; otherwise it is reported.
+Figures include tracemalloc overhead, so compare runs with each other rather
+than with production timings.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gc
+import logging
+import os
+import statistics
+import time
+import tracemalloc
+
+import pytest
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import issue_registry as ir
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.tellink.const import DOMAIN
+from custom_components.tellink.coordinator import TellinkCoordinator
+
+ENTRIES = int(os.environ.get("TELLINK_SOAK_ENTRIES", "200"))
+CYCLES = int(os.environ.get("TELLINK_SOAK_CYCLES", "20"))
+# Every RELOAD_EVERY cycles a slice of entries is reloaded and has options edited
+RELOAD_EVERY = 5
+CHURN_FRACTION = 0.05
+
+# Late setups may cost at most this many times the early ones (catches O(N^2))
+MAX_SETUP_SLOWDOWN = float(os.environ.get("TELLINK_SOAK_MAX_SLOWDOWN", "3.0"))
+# Wall-clock checks flake on shared runners; only enforce them when asked
+STRICT_TIMING = os.environ.get("TELLINK_SOAK_STRICT") == "1"
+# Memory still attributed to the integration after every entry is removed
+MAX_RETAINED_BYTES = 256 * 1024
+
+TELLINK_FILES = os.path.join("custom_components", "tellink")
+
+
+class LoopLagMonitor:
+    """Measure how late a short sleep wakes up, per test phase."""
+
+    def __init__(self, interval: float = 0.005) -> None:
+        self.interval = interval
+        self.phase = "idle"
+        self.samples: dict[str, list[float]] = {}
+        self._task: asyncio.Task | None = None
+
+    async def _run(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = time.perf_counter() - start - self.interval
+            self.samples.setdefault(self.phase, []).append(max(lag, 0.0))
+
+    def start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+
+def _percentiles(values: list[float]) -> dict[str, float]:
+    if len(values) < 2:
+        value = values[0] if values else 0.0
+        return {"p50": value, "p95": value, "p99": value, "max": value}
+    cuts = statistics.quantiles(values, n=100, method="inclusive")
+    return {"p50": cuts[49], "p95": cuts[94], "p99": cuts[98], "max": max(values)}
+
+
+def _tellink_bytes(stats: list[tracemalloc.StatisticDiff]) -> int:
+    return sum(s.size_diff for s in stats if TELLINK_FILES in s.traceback[0].filename)
+
+
+def _new_entry(index: int) -> MockConfigEntry:
+    username = f"soak{index:05d}"
+    return MockConfigEntry(
+        domain=DOMAIN,
+        title=f"Tellink ({username})",
+        unique_id=username,
+        version=4,
+        data={"username": username, "password": None},
+        options={"scan_interval": 3600, "retry_interval": 600},
+    )
+
+
+def _preload_credentials(hass_storage: dict, entries: list[MockConfigEntry]) -> None:
+    hass_storage["tellink_credentials"] = {
+        "version": 1,
+        "minor_version": 1,
+        "key": "tellink_credentials",
+        "data": {
+            e.entry_id: {"username": e.data["username"], "password": "secret"}
+            for e in entries
+        },
+    }
+
+
+def _tellink_issues(hass: HomeAssistant) -> list:
+    registry = ir.async_get(hass)
+    return [i for (domain, _), i in registry.issues.items() if domain == DOMAIN]
+
+
+async def _setup_batch(hass: HomeAssistant, entries: list[MockConfigEntry]) -> float:
+    """Set up entries one by one and return the mean seconds per entry."""
+    started = time.perf_counter()
+    for entry in entries:
+        entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return (time.perf_counter() - started) / len(entries)
+
+
+@pytest.mark.soak
+async def test_soak(
+    hass: HomeAssistant,
+    hass_storage: dict,
+    fake_api,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Drive hundreds of entries through their whole lifecycle."""
+    # Injected failures log on every cycle; captured records would also keep
+    # the exceptions (and through them the coordinators) alive
+    caplog.set_level(logging.CRITICAL, logger="custom_components.tellink")
+    # Debug logging of every state change would dominate the lag figures
+    caplog.set_level(logging.WARNING, logger="homeassistant")
+    warmup = _new_entry(99999)
+    entries = [_new_entry(i) for i in range(ENTRIES)]
+    _preload_credentials(hass_storage, [warmup, *entries])
+    churn = max(1, int(ENTRIES * CHURN_FRACTION))
+
+    # Warm up imports and platforms so the baseline excludes one-off costs
+    await _setup_batch(hass, [warmup])
+    await hass.config_entries.async_remove(warmup.entry_id)
+    await hass.async_block_till_done()
+
+    monitor = LoopLagMonitor()
+    monitor.start()
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.take_snapshot()
+
+    # --- setup, in two halves to compare per-entry cost ---
+    monitor.phase = "setup"
+    half = ENTRIES // 2
+    early = await _setup_batch(hass, entries[:half])
+    late = await _setup_batch(hass, entries[half:])
+    assert len(hass.data[DOMAIN]) == ENTRIES
+
+    # --- update fan-out with failures, auth churn, reloads and option edits ---
+    cycle_alloc: list[int] = []
+    cycle_growth: list[int] = []
+    cycle_seconds: list[float] = []
+    max_issues = 0
+    for cycle in range(CYCLES):
+        monitor.phase = "update"
+        fake_api.inject_failures = True
+        if cycle == 1:
+            fake_api.rejected = {e.data["username"] for e in entries[:churn]}
+
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        started = time.perf_counter()
+        coordinators = list(hass.data[DOMAIN].values())
+        await asyncio.gather(*(c.async_refresh() for c in coordinators))
+        await hass.async_block_till_done()
+        cycle_seconds.append(time.perf_counter() - started)
+        del coordinators
+        current, peak = tracemalloc.get_traced_memory()
+        cycle_alloc.append(peak - before)
+        cycle_growth.append(current - before)
+        max_issues = max(max_issues, len(_tellink_issues(hass)))
+        fake_api.inject_failures = False
+
+        if cycle % RELOAD_EVERY == RELOAD_EVERY - 1:
+            monitor.phase = "reload"
+            # Reauthenticated entries come back and clear their own issues
+            fake_api.rejected = set()
+            offset = (cycle // RELOAD_EVERY) * churn
+            for entry in entries[:churn] + entries[offset : offset + churn]:
+                await hass.config_entries.async_reload(entry.entry_id)
+            for entry in entries[-churn:]:
+                hass.config_entries.async_update_entry(
+                    entry, options={**entry.options, "scan_interval": 1800 + cycle}
+                )
+            await hass.async_block_till_done()
+
+    # Reauthenticate whatever the last cycles rejected
+    monitor.phase = "reload"
+    fake_api.rejected = set()
+    for entry in entries[:churn]:
+        await hass.config_entries.async_reload(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert all(e.state is ConfigEntryState.LOADED for e in entries)
+    assert not _tellink_issues(hass)
+
+    # --- unload and remove everything ---
+    monitor.phase = "unload"
+    for entry in entries:
+        await hass.config_entries.async_remove(entry.entry_id)
+    await hass.async_block_till_done()
+    await monitor.stop()
+
+    caplog.clear()
+    gc.collect()
+    retained = tracemalloc.take_snapshot().compare_to(baseline, "filename")
+    tracemalloc.stop()
+    retained_tellink = _tellink_bytes(retained)
+    retained_total = sum(s.size_diff for s in retained)
+    live_coordinators = [o for o in gc.get_objects() if isinstance(o, TellinkCoordinator)]
+
+    lines = [
+        f"Tellink soak: {ENTRIES} entries x {CYCLES} cycles "
+        f"({fake_api.calls} fetches, peak {max_issues} Repairs issues)",
+        f"setup per entry: early {early * 1000:.2f} ms, late {late * 1000:.2f} ms "
+        f"(x{late / early:.2f}, limit x{MAX_SETUP_SLOWDOWN:.1f}"
+        f"{'' if STRICT_TIMING else ', not enforced'})",
+        "event-loop lag (ms):",
+    ]
+    for phase, samples in monitor.samples.items():
+        p = _percentiles(samples)
+        lines.append(
+            f"  {phase:<7} n={len(samples):<6} p50={p['p50'] * 1000:.2f} "
+            f"p95={p['p95'] * 1000:.2f} p99={p['p99'] * 1000:.2f} "
+            f"max={p['max'] * 1000:.2f}"
+        )
+    lines += [
+        f"update cycle: median {statistics.median(cycle_seconds) * 1000:.1f} ms, "
+        f"allocated peak median {statistics.median(cycle_alloc) / 1024:.1f} KiB, "
+        f"net growth median {statistics.median(cycle_growth) / 1024:.1f} KiB",
+        f"retained after removal: tellink {retained_tellink / 1024:.1f} KiB, "
+        f"total {retained_total / 1024:.1f} KiB",
+        f"live coordinators after removal: {len(live_coordinators)}",
+    ]
+    report = "\n".join(lines)
+    print(report)
+    if path := os.environ.get("TELLINK_SOAK_REPORT"):
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(report + "\n")
+
+    assert DOMAIN not in hass.data
+    assert not _tellink_issues(hass)
+    assert not live_coordinators
+    if STRICT_TIMING:
+        assert late <= early * MAX_SETUP_SLOWDOWN
+    assert retained_tellink <= MAX_RETAINED_BYTES